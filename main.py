@@ -1,13 +1,25 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, PrivateAttr, TypeAdapter
 import httpx
 import xml.etree.ElementTree as ET
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import logging
 import asyncio
-import xmltodict
+import time
+import re
+import queue
+import threading
+import functools
+import hashlib
+from contextlib import asynccontextmanager, suppress
+
+# pyahocorasick es opcional: sin él se usa una expresión regular equivalente
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # Configurar logging
 logging.basicConfig(level=logging.DEBUG)
@@ -19,12 +31,38 @@ class Product(BaseModel):
     summary: Optional[str] = ""
     link: str
     category: Optional[str] = ""
+    
+    # Título y resumen en minúsculas, calculados una sola vez al leer el feed (no se exponen en la API)
+    _title_lc: str = PrivateAttr(default="")
+    _summary_lc: str = PrivateAttr(default="")
+
+# Serializador de listas de productos a JSON (en Rust, vía pydantic-core)
+PRODUCT_LIST_ADAPTER = TypeAdapter(Tuple[Product, ...])
+
+# Crear un único cliente HTTP para toda la vida de la aplicación y cerrarlo al apagarla
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.http = httpx.AsyncClient(
+        timeout=httpx.Timeout(30.0, read=60.0),
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=4),
+    )
+    try:
+        yield
+    finally:
+        # Detener una actualización en curso antes de cerrar el cliente que está usando
+        if _refresh_task is not None and not _refresh_task.done():
+            _refresh_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await _refresh_task
+        await app.state.http.aclose()
 
 # Crear la aplicación FastAPI
 app = FastAPI(
     title="API de Productos Comandato por Categorías",
     description="API para obtener productos de Comandato desde su feed XML organizados por categorías",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configurar CORS para permitir solicitudes desde cualquier origen
@@ -39,99 +77,248 @@ app.add_middleware(
 # URL del feed XML de Comandato
 XML_FEED_URL = "https://www.comandato.com/XMLData/atomfeed.xml"
 
-# Función para clasificar productos según su título
-def categorize_product(title):
-    title_lower = title.lower()
+# Cabeceras de la petición del feed. Accept-Encoding se deja en manos de httpx, que solo
+# anuncia las compresiones que sabe descomprimir (br únicamente si brotli está instalado)
+FEED_REQUEST_HEADERS = {"Accept": "application/atom+xml"}
+
+# Tamaño de los bloques que se entregan al parser mientras se descarga el feed
+FEED_CHUNK_SIZE = 65536
+
+# Máximo de bloques en espera entre la descarga y el parser; si se llena, la descarga espera
+FEED_QUEUE_SIZE = 4
+
+# Tiempo (en segundos) que se reutilizan los productos antes de volver a descargar el feed
+CACHE_TTL = 300
+
+# Tiempo (en segundos) que se espera tras una actualización fallida antes de volver a consultar el feed
+REFRESH_RETRY_DELAY = 30
+
+# Caché en memoria de los productos ya parseados y sus índices por categoría.
+# feed_validators guarda el ETag/Last-Modified de la versión del feed de la que salen los productos
+_cache = {"products": None, "products_json": b"[]", "etag": None, "by_category": {}, "categories": [], "haystack": [], "feed_validators": None, "expires_at": 0.0}
+
+# Tarea de actualización en curso; todas las solicitudes comparten la misma descarga
+_refresh_task = None
+_refresh_retry_at = 0.0
+
+# Palabras clave de cada categoría, en orden de prioridad (la primera que coincida gana).
+# Son tuplas inmutables construidas una sola vez al importar el módulo
+CATEGORY_KEYWORDS = (
+    ("Televisores", ("televisor", "led", "smart tv", "uhd", "4k", "nanocell")),
+    ("Parlantes", ("parlante", "torre de sonido", "barra de sonido", "minicomponente", "sound bar")),
+    ("Celulares", ("celular", "iphone", "smartphone", "honor", "infinix", "tecno")),
+    ("Laptops", ("laptop", "portátil", "notebook", "core i", "ryzen")),
+    ("Impresoras", ("impresora", "multifunción", "epson", "canon", "brother")),
+    ("Cocina a gas", ("cocina a gas", "cocina", "hornilla", "quemador", "indurama", "mabe")),
+    ("Refrigeradoras", ("refrigeradora", "side by side", "top freezer")),
+    ("Frigobares", ("frigobar",)),
+    ("Congeladores", ("congelador", "horizontal")),
+    ("Vitrinas", ("vitrina",)),
+    ("Lavadoras", ("lavadora", "automática", "semiautomática")),
+    ("Secadoras", ("secadora",)),
+    ("Torres de lavado", ("torre de lavado",)),
+    ("Aire Acondicionado Split", ("aire acondicionado", "split", "btu")),
+    ("Cafeteras", ("cafetera", "máquina de café")),
+    ("Canguileras", ("canguilera",)),
+    ("Horno Microondas", ("microonda", "microondas")),
+    ("Freidoras", ("freidora", "airfryer")),
+    ("Licuadoras", ("licuadora",)),
+    ("Ollas", ("olla", "arrocera")),
+    ("Exprimidores", ("exprimidor", "extractor de jugo")),
+    ("Sanducheras", ("sanduchera", "grill")),
+    ("Planchas", ("plancha",)),
+    ("Hervidores", ("hervidor", "eléctrico")),
+)
+
+# Palabras que descartan una categoría aunque coincida alguna de sus palabras clave
+# (los microondas no son cocinas a gas aunque mencionen "cocina")
+EXCLUSIONS = {"Cocina a gas": ("microonda",)}
+EXCLUSION_WORDS = frozenset(word for words in EXCLUSIONS.values() for word in words)
+
+# Construir una sola vez el autómata Aho-Corasick con todas las palabras clave y de exclusión
+KEYWORD_AUTOMATON = None
+if ahocorasick is not None:
+    KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for priority, (category, keywords) in enumerate(CATEGORY_KEYWORDS):
+        for keyword in keywords:
+            # Si la palabra clave se repite, conservar la categoría de mayor prioridad
+            if keyword not in KEYWORD_AUTOMATON:
+                KEYWORD_AUTOMATON.add_word(keyword, (priority, category, keyword))
+    for word in EXCLUSION_WORDS:
+        # Las palabras de exclusión que no son palabras clave solo sirven como marcador
+        if word not in KEYWORD_AUTOMATON:
+            KEYWORD_AUTOMATON.add_word(word, (None, None, word))
+    KEYWORD_AUTOMATON.make_automaton()
+
+# Alternativa sin dependencias: una sola expresión regular con un grupo con nombre por categoría.
+# El lookahead permite encontrar coincidencias en todas las posiciones, aunque se solapen,
+# y en cada posición gana la categoría de mayor prioridad por el orden de la alternancia.
+CATEGORY_RE = re.compile("(?=(?:" + "|".join(
+    f"(?P<c{priority}>{'|'.join(map(re.escape, keywords))})"
+    for priority, (category, keywords) in enumerate(CATEGORY_KEYWORDS)
+) + "))")
+GROUP_TO_CATEGORY = {
+    f"c{priority}": (priority, category)
+    for priority, (category, keywords) in enumerate(CATEGORY_KEYWORDS)
+}
+
+# Función para recorrer el título y obtener las categorías candidatas, como (prioridad, categoría),
+# y las palabras de exclusión que aparecen en él
+def _scan_title(title_lower):
+    candidates = set()
+    excluded_words = set()
     
-    if any(keyword in title_lower for keyword in ["televisor", "led", "smart tv", "uhd", "4k", "nanocell"]):
-        return "Televisores"
-    elif any(keyword in title_lower for keyword in ["parlante", "torre de sonido", "barra de sonido", "minicomponente", "sound bar"]):
-        return "Parlantes"
-    elif any(keyword in title_lower for keyword in ["celular", "iphone", "smartphone", "honor", "infinix", "tecno"]):
-        return "Celulares"
-    elif any(keyword in title_lower for keyword in ["laptop", "portátil", "notebook", "core i", "ryzen"]):
-        return "Laptops"
-    elif any(keyword in title_lower for keyword in ["impresora", "multifunción", "epson", "canon", "brother"]):
-        return "Impresoras"
-    elif any(keyword in title_lower for keyword in ["cocina a gas", "cocina", "hornilla", "quemador", "indurama", "mabe"]) and "microonda" not in title_lower:
-        return "Cocina a gas"
-    elif any(keyword in title_lower for keyword in ["refrigeradora", "side by side", "top freezer"]):
-        return "Refrigeradoras"
-    elif any(keyword in title_lower for keyword in ["frigobar"]):
-        return "Frigobares"
-    elif any(keyword in title_lower for keyword in ["congelador", "horizontal"]):
-        return "Congeladores"
-    elif any(keyword in title_lower for keyword in ["vitrina"]):
-        return "Vitrinas"
-    elif any(keyword in title_lower for keyword in ["lavadora", "automática", "semiautomática"]):
-        return "Lavadoras"
-    elif any(keyword in title_lower for keyword in ["secadora"]):
-        return "Secadoras"
-    elif any(keyword in title_lower for keyword in ["torre de lavado"]):
-        return "Torres de lavado"
-    elif any(keyword in title_lower for keyword in ["aire acondicionado", "split", "btu"]):
-        return "Aire Acondicionado Split"
-    elif any(keyword in title_lower for keyword in ["cafetera", "máquina de café"]):
-        return "Cafeteras"
-    elif any(keyword in title_lower for keyword in ["canguilera"]):
-        return "Canguileras"
-    elif any(keyword in title_lower for keyword in ["microonda", "microondas"]):
-        return "Horno Microondas"
-    elif any(keyword in title_lower for keyword in ["freidora", "airfryer"]):
-        return "Freidoras"
-    elif any(keyword in title_lower for keyword in ["licuadora"]):
-        return "Licuadoras"
-    elif any(keyword in title_lower for keyword in ["olla", "arrocera"]):
-        return "Ollas"
-    elif any(keyword in title_lower for keyword in ["exprimidor", "extractor de jugo"]):
-        return "Exprimidores"
-    elif any(keyword in title_lower for keyword in ["sanduchera", "grill"]):
-        return "Sanducheras"
-    elif any(keyword in title_lower for keyword in ["plancha"]):
-        return "Planchas"
-    elif any(keyword in title_lower for keyword in ["hervidor", "eléctrico"]):
-        return "Hervidores"
+    if KEYWORD_AUTOMATON is not None:
+        # Una sola pasada detecta tanto las palabras clave como las de exclusión
+        for _, (priority, category, word) in KEYWORD_AUTOMATON.iter(title_lower):
+            if priority is not None:
+                candidates.add((priority, category))
+            if word in EXCLUSION_WORDS:
+                excluded_words.add(word)
     else:
-        return "Otros"
+        for match in CATEGORY_RE.finditer(title_lower):
+            candidates.add(GROUP_TO_CATEGORY[match.lastgroup])
+        # La expresión regular solo informa una palabra por posición, así que las exclusiones se buscan aparte
+        excluded_words = {word for word in EXCLUSION_WORDS if word in title_lower}
+    
+    return candidates, excluded_words
+
+# Función para clasificar productos según su título (ya convertido a minúsculas)
+def categorize_product(title_lower):
+    candidates, excluded_words = _scan_title(title_lower)
+    
+    # Quedarse con la categoría de mayor prioridad que no esté descartada por una exclusión
+    for priority, category in sorted(candidates):
+        if excluded_words and any(word in excluded_words for word in EXCLUSIONS.get(category, ())):
+            continue
+        return category
+    
+    return "Otros"
+
+# Función para obtener el nombre de una etiqueta sin el espacio de nombres (ej. Atom)
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+# Función para convertir un elemento <entry> del feed en un producto
+def _entry_to_product(entry):
+    title = ""
+    summary = ""
+    link = ""
+    
+    for child in entry:
+        name = _local_name(child.tag)
+        if name == "title":
+            title = child.text or ""
+        elif name == "summary":
+            summary = child.text or ""
+        elif name == "link" and not link:
+            # En Atom el enlace suele venir como atributo href
+            link = child.get("href") or child.text or ""
+    
+    title_lc = title.lower()
+    summary_lc = summary.lower()
+    
+    # Asignar categoría basada en el título
+    category = categorize_product(title_lc)
+    
+    # Los campos vienen de nuestro propio parser, así que se omite la validación de Pydantic
+    product = Product.model_construct(title=title, summary=summary, link=link, category=category)
+    product._title_lc = title_lc
+    product._summary_lc = summary_lc
+    return product
+
+# Función para procesar los eventos pendientes del parser y extraer las entradas completas
+def _drain_entries(parser, products):
+    for _, element in parser.read_events():
+        if _local_name(element.tag) == "entry":
+            products.append(_entry_to_product(element))
+            # Liberar el contenido de la entrada ya procesada; el elemento vacío que queda es despreciable
+            element.clear()
+
+# Función para parsear el feed a medida que llegan los bloques y clasificar sus productos
+# (trabajo de CPU, se ejecuta en un hilo). Devuelve None si la descarga se interrumpió
+def _parse_stream(chunks, aborted, failed):
+    parser = ET.XMLPullParser(events=("end",))
+    products = []
+    
+    try:
+        while True:
+            chunk = chunks.get()
+            if aborted.is_set():
+                return None
+            if chunk is None:
+                break
+            parser.feed(chunk)
+            _drain_entries(parser, products)
+        
+        parser.close()
+        _drain_entries(parser, products)
+        return products
+    except Exception:
+        # Avisar a la descarga para que se detenga, y vaciar la cola hasta su último bloque
+        # para que la descarga nunca quede bloqueada esperando sitio
+        failed.set()
+        while chunks.get() is not None and not aborted.is_set():
+            pass
+        if aborted.is_set():
+            return None
+        raise
+
+# Función para descargar el cuerpo del feed y entregarlo en bloques al hilo del parser.
+# La cola es limitada: si el parser va atrasado, la descarga espera (fuera del event loop)
+async def _download_bytes(response, chunks, aborted, failed):
+    try:
+        async for chunk in response.aiter_bytes(FEED_CHUNK_SIZE):
+            # El parser ya falló: no tiene sentido seguir descargando
+            if failed.is_set():
+                break
+            await asyncio.to_thread(chunks.put, chunk)
+    except BaseException:
+        # Despertar al parser si está esperando un bloque; si la cola está llena, verá la marca al leer el siguiente
+        aborted.set()
+        with suppress(queue.Full):
+            chunks.put_nowait(None)
+        raise
+    await asyncio.to_thread(chunks.put, None)
 
 # Función para obtener y parsear los productos del feed XML
-async def fetch_products():
+# Devuelve los productos junto con los validadores (ETag/Last-Modified) de la respuesta.
+# Si se pasan validators y el feed no cambió desde esa versión, devuelve None
+async def fetch_products(client, validators=None):
     max_retries = 3
     retry_count = 0
-    timeout = httpx.Timeout(30.0, read=60.0)
+    
+    headers = dict(FEED_REQUEST_HEADERS)
+    if validators:
+        if validators["etag"]:
+            headers["If-None-Match"] = validators["etag"]
+        if validators["last_modified"]:
+            headers["If-Modified-Since"] = validators["last_modified"]
     
     while retry_count < max_retries:
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                logger.debug(f"Intento {retry_count+1} de obtener datos de {XML_FEED_URL}")
-                response = await client.get(XML_FEED_URL)
+            logger.debug(f"Intento {retry_count+1} de obtener datos de {XML_FEED_URL}")
+            async with client.stream("GET", XML_FEED_URL, headers=headers) as response:
+                if response.status_code == 304:
+                    logger.debug("El feed no ha cambiado desde la última descarga")
+                    return None
                 response.raise_for_status()
                 
-                # Convertir XML a diccionario
-                data = xmltodict.parse(response.text)
+                # Parsear y clasificar en un hilo mientras se descarga: no bloquea otras
+                # solicitudes y solo mantiene en memoria unos pocos bloques del feed
+                chunks = queue.Queue(maxsize=FEED_QUEUE_SIZE)
+                aborted = threading.Event()
+                failed = threading.Event()
+                parsing = asyncio.ensure_future(asyncio.to_thread(_parse_stream, chunks, aborted, failed))
+                await _download_bytes(response, chunks, aborted, failed)
+                products = await parsing
                 
-                products = []
-                entries = data.get('feed', {}).get('entry', [])
+                validators = {
+                    "etag": response.headers.get("etag"),
+                    "last_modified": response.headers.get("last-modified"),
+                }
                 
-                # Si solo hay una entrada, convertirla a lista
-                if not isinstance(entries, list):
-                    entries = [entries]
-                    
-                for entry in entries:
-                    title = entry.get('title', '')
-                    summary = entry.get('summary', '')
-                    link = entry.get('link', '')
-                    
-                    # Si link es un diccionario (común en algunos feeds)
-                    if isinstance(link, dict):
-                        link = link.get('@href', '')
-                    
-                    # Asignar categoría basada en el título
-                    category = categorize_product(title)
-                    
-                    products.append(Product(title=title, summary=summary, link=link, category=category))
-                    
-                return products
+            return products, validators
                 
         except httpx.ReadTimeout:
             retry_count += 1
@@ -147,6 +334,100 @@ async def fetch_products():
             logger.error(f"Error general: {e}")
             raise HTTPException(status_code=500, detail=f"Error al procesar los datos: {str(e)}")
 
+# Función para construir los datos de la caché y sus índices (trabajo de CPU, se ejecuta en un hilo)
+def _build_cache(products):
+    # Guardar los productos como tupla: inmutable y sin la reserva extra de memoria de una lista
+    products = tuple(products)
+    
+    # Agrupar los productos por categoría (en minúsculas) en una sola pasada
+    by_category = {}
+    for product in products:
+        by_category.setdefault(product.category.lower(), []).append(product)
+    
+    # Guardar /products/ ya serializado para no repetir la serialización en cada solicitud
+    products_json = PRODUCT_LIST_ADAPTER.dump_json(products)
+    
+    return {
+        "products": products,
+        "products_json": products_json,
+        # ETag común a los endpoints que dependen de la lista completa de productos
+        "etag": '"' + hashlib.blake2b(products_json, digest_size=16).hexdigest() + '"',
+        "by_category": by_category,
+        "categories": sorted({product.category for product in products}),
+        # Texto de búsqueda por producto; el separador evita coincidencias entre título y resumen
+        "haystack": [product._title_lc + "\x00" + product._summary_lc for product in products],
+    }
+
+# Función para descargar el feed y reconstruir la caché y sus índices
+async def _refresh_cache():
+    global _refresh_retry_at
+    try:
+        result = await fetch_products(app.state.http, _cache["feed_validators"] if _cache["products"] is not None else None)
+        
+        # El feed no cambió: reutilizar los productos ya parseados
+        if result is None:
+            _cache["expires_at"] = time.monotonic() + CACHE_TTL
+            return _cache["products"]
+        
+        products, validators = result
+        fresh = await asyncio.to_thread(_build_cache, products)
+    except Exception:
+        # No volver a consultar el feed en cada solicitud mientras siga fallando
+        _refresh_retry_at = time.monotonic() + REFRESH_RETRY_DELAY
+        raise
+    
+    # Los validadores se publican junto con los productos de esa misma versión del feed
+    fresh["feed_validators"] = validators
+    fresh["expires_at"] = time.monotonic() + CACHE_TTL
+    
+    # Publicar todos los datos nuevos de una sola vez
+    _cache.update(fresh)
+    return fresh["products"]
+
+# Función para registrar los errores de una actualización en segundo plano, que nadie está esperando
+# (en la primera carga el error ya llega a las solicitudes que esperan la tarea)
+def _log_refresh_error(task, background):
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None and background:
+        logger.error(f"Error al actualizar la caché de productos: {error}")
+
+# Función para iniciar la actualización de la caché, o reutilizar la que ya está en curso.
+# Tras un fallo reciente devuelve la tarea fallida en lugar de volver a consultar el feed
+def _start_refresh(background):
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        if time.monotonic() < _refresh_retry_at:
+            return _refresh_task
+        _refresh_task = asyncio.create_task(_refresh_cache())
+        _refresh_task.add_done_callback(functools.partial(_log_refresh_error, background=background))
+    return _refresh_task
+
+# Función para obtener los productos desde la caché, descargando el feed solo si expiró
+async def get_products_cached():
+    if _cache["products"] is not None:
+        # Si expiró, servir los datos actuales mientras se actualizan en segundo plano
+        if time.monotonic() >= _cache["expires_at"]:
+            _start_refresh(background=True)
+        return _cache["products"]
+    
+    # Primera carga: todas las solicitudes esperan la misma descarga.
+    # shield evita que una solicitud cancelada cancele la descarga de las demás
+    return await asyncio.shield(_start_refresh(background=False))
+
+# Función para obtener las cabeceras de caché HTTP de los datos actuales
+def _cache_headers():
+    return {"ETag": _cache["etag"], "Cache-Control": f"public, max-age={CACHE_TTL}"}
+
+# Función para saber si el cliente ya tiene la versión actual de los datos (If-None-Match)
+def _is_not_modified(request):
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or _cache["etag"] in tags
+
 # Endpoint para la página principal
 @app.get("/")
 async def root():
@@ -164,12 +445,15 @@ async def root():
 
 # Endpoint para obtener todos los productos
 @app.get("/products/", response_model=List[Product], tags=["productos"])
-async def get_all_products():
+async def get_all_products(request: Request):
     """
     Obtiene todos los productos disponibles en el feed de Comandato.
     """
     try:
-        return await fetch_products()
+        await get_products_cached()
+        if _is_not_modified(request):
+            return Response(status_code=304, headers=_cache_headers())
+        return Response(content=_cache["products_json"], media_type="application/json", headers=_cache_headers())
     except Exception as e:
         return JSONResponse(
             status_code=503,
@@ -185,10 +469,13 @@ async def search_products(term: str):
     - **term**: Término de búsqueda
     """
     try:
-        products = await fetch_products()
-        return [product for product in products 
-                if term.lower() in product.title.lower() 
-                or term.lower() in product.summary.lower()]
+        products = await get_products_cached()
+        term_lower = term.lower()
+        # El XML no admite el carácter nulo, así que ningún producto puede contenerlo
+        if "\x00" in term_lower:
+            return []
+        return [product for product, text in zip(products, _cache["haystack"]) 
+                if term_lower in text]
     except Exception as e:
         return JSONResponse(
             status_code=503,
@@ -203,11 +490,15 @@ async def get_product_by_index(index: int):
     
     - **index**: Índice del producto (comienza en 0)
     """
-    try:
-        products = await fetch_products()
-        if 0 <= index < len(products):
-            return products[index]
+    # Rechazar índices negativos sin consultar la caché
+    if index < 0:
         raise HTTPException(status_code=404, detail="Producto no encontrado")
+    
+    try:
+        products = await get_products_cached()
+        if index >= len(products):
+            raise HTTPException(status_code=404, detail="Producto no encontrado")
+        return products[index]
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -218,14 +509,16 @@ async def get_product_by_index(index: int):
 
 # Endpoint para obtener todas las categorías disponibles
 @app.get("/categories/", tags=["categorías"])
-async def get_categories():
+async def get_categories(request: Request, response: Response):
     """
     Obtiene todas las categorías disponibles de productos.
     """
     try:
-        products = await fetch_products()
-        categories = set(product.category for product in products)
-        return {"categories": sorted(list(categories))}
+        await get_products_cached()
+        if _is_not_modified(request):
+            return Response(status_code=304, headers=_cache_headers())
+        response.headers.update(_cache_headers())
+        return {"categories": _cache["categories"]}
     except Exception as e:
         return JSONResponse(
             status_code=503,
@@ -234,19 +527,22 @@ async def get_categories():
 
 # Endpoint para obtener productos por categoría
 @app.get("/categories/{category_name}", response_model=List[Product], tags=["categorías"])
-async def get_products_by_category(category_name: str):
+async def get_products_by_category(category_name: str, request: Request, response: Response):
     """
     Obtiene todos los productos de una categoría específica.
     
     - **category_name**: Nombre de la categoría
     """
     try:
-        products = await fetch_products()
-        category_products = [product for product in products if product.category.lower() == category_name.lower()]
+        await get_products_cached()
+        category_products = _cache["by_category"].get(category_name.lower())
         
         if not category_products:
             raise HTTPException(status_code=404, detail=f"No se encontraron productos en la categoría: {category_name}")
-            
+        
+        if _is_not_modified(request):
+            return Response(status_code=304, headers=_cache_headers())
+        response.headers.update(_cache_headers())
         return category_products
     except HTTPException as e:
         raise e